@@ -9,8 +9,7 @@ import argparse
 import os
 import sys
 import logging
-from pathlib import Path
-from typing import List
+from typing import Callable, List
 
 from dotenv import load_dotenv
 from openwebui_uploader import OpenWebUIClient
@@ -29,6 +28,17 @@ def setup_logging(verbose: bool = False):
     )
 
 
+# Allowed extensions: md, txt, pdf, doc, docx
+_ALLOWED_EXTENSIONS = frozenset({".md", ".txt", ".pdf", ".doc", ".docx"})
+
+# Vendor/metadata directories that never contain uploadable documents;
+# pruned during the walk so their (often huge) contents are never listed
+_PRUNED_DIRS = frozenset({".git", "node_modules", "__pycache__", ".venv"})
+
+# System files to skip regardless of extension
+_SKIP_FILENAMES = frozenset({".ds_store", "thumbs.db"})
+
+
 def is_allowed_file(file_path: str) -> bool:
     """
     Check if a file should be processed based on its extension and filename.
@@ -39,64 +49,71 @@ def is_allowed_file(file_path: str) -> bool:
     Returns:
         True if file should be processed, False if it should be skipped
     """
-    path = Path(file_path)
-    filename = path.name.lower()
+    # Called once per file on large trees, so avoid Path allocation and
+    # per-call set construction: plain string ops on the basename suffice
+    filename = os.path.basename(file_path).lower()
 
     # Skip system files
-    if filename in [".ds_store", "thumbs.db"]:
+    if filename in _SKIP_FILENAMES:
         return False
 
-    # Get file extension (case-insensitive)
-    extension = path.suffix.lower()
-
-    # Allowed extensions: md, txt, pdf, doc, docx
-    allowed_extensions = {".md", ".txt", ".pdf", ".doc", ".docx"}
-
-    return extension in allowed_extensions
+    # Get file extension (case-insensitive); dot > 0 so dotfiles like
+    # ".md" have no extension, matching Path.suffix semantics
+    dot = filename.rfind(".")
+    return dot > 0 and filename[dot:] in _ALLOWED_EXTENSIONS
 
 
-def collect_files(directory: str, recursive: bool = True) -> List[str]:
+def collect_files(
+    directory: str,
+    recursive: bool = True,
+    filter_fn: Callable[[str], bool] = is_allowed_file,
+) -> List[str]:
     """
     Collect all files from a directory.
 
+    Vendor and metadata directories (.git, node_modules, __pycache__, .venv)
+    are pruned during the walk and never descended into.
+
     Args:
         directory: Path to the directory
         recursive: If True, scan subdirectories recursively
+        filter_fn: Predicate deciding whether a file is included
+            (default: is_allowed_file)
 
     Returns:
         List of file paths
     """
-    directory_path = Path(directory)
-    if not directory_path.exists():
+    if not os.path.exists(directory):
         raise ValueError(f"Directory does not exist: {directory}")
 
-    if not directory_path.is_dir():
+    if not os.path.isdir(directory):
         raise ValueError(f"Path is not a directory: {directory}")
 
     logger = logging.getLogger(__name__)
     files = []
     skipped_count = 0
 
-    if recursive:
-        for file_path in directory_path.rglob("*"):
-            if file_path.is_file():
-                if is_allowed_file(str(file_path)):
-                    files.append(str(file_path))
-                else:
-                    skipped_count += 1
-                    logger.debug(f"Skipping file: {file_path}")
-    else:
-        for file_path in directory_path.iterdir():
-            if file_path.is_file():
-                if is_allowed_file(str(file_path)):
-                    files.append(str(file_path))
-                else:
-                    skipped_count += 1
-                    logger.debug(f"Skipping file: {file_path}")
+    # Walk with os.scandir: DirEntry carries the file type from the directory
+    # read itself, so is_file()/is_dir() need no extra stat() per entry
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_file(follow_symlinks=False):
+                    if filter_fn(entry.path):
+                        files.append(entry.path)
+                    else:
+                        skipped_count += 1
+                        logger.debug("Skipping file: %s", entry.path)
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    if entry.name in _PRUNED_DIRS:
+                        logger.debug("Pruning directory: %s", entry.path)
+                        continue
+                    stack.append(entry.path)
 
     if skipped_count > 0:
         logger.info(
-            f"Skipped {skipped_count} file(s) (system files or unsupported formats)"
+            "Skipped %s file(s) (system files or unsupported formats)", skipped_count
         )
 
     return sorted(files)
@@ -174,6 +191,14 @@ Examples:
         help="Do not scan subdirectories",
     )
 
+    parser.add_argument(
+        "--max-inflight",
+        type=int,
+        default=16,
+        help="Maximum number of concurrent file uploads (default: 16). "
+        "Lower this if the server struggles under load",
+    )
+
     parser.add_argument(
         "--verbose", "-v", action="store_true", help="Enable verbose logging"
     )
@@ -205,26 +230,41 @@ Examples:
 
     try:
         # Collect files
-        logger.info(f"Collecting files from: {args.path}")
+        logger.info("Collecting files from: %s", args.path)
         files = collect_files(args.path, recursive=args.recursive)
 
         if not files:
-            logger.warning(f"No files found in {args.path}")
+            logger.warning("No files found in %s", args.path)
             sys.exit(0)
 
-        logger.info(f"Found {len(files)} file(s) to upload")
+        logger.info("Found %s file(s) to upload", len(files))
 
-        # Initialize client
+        # Initialize client and pre-warm the connection pool so the first
+        # uploads don't serialize on DNS/TLS setup
         client = OpenWebUIClient(api_endpoint=args.endpoint, api_key=args.api_key)
-
-        # Upload files
-        logger.info(f"Uploading files to knowledge collection: {args.knowledge}")
-        results = client.upload_files_to_knowledge(
+        client.connect()
+
+        # Upload files, streaming one progress line per completed file
+        # instead of buffering the full result set
+        logger.info("Uploading files to knowledge collection: %s", args.knowledge)
+        results = {"success": 0, "failed": 0, "total": len(files), "errors": []}
+        completed = 0
+        for file_path, success, error in client.iter_upload_files_to_knowledge(
             knowledge_name=args.knowledge,
             file_paths=files,
             create_if_missing=args.create,
             description=args.description,
-        )
+            max_concurrency=args.max_inflight,
+        ):
+            completed += 1
+            if success:
+                results["success"] += 1
+                logger.info("[%d/%d] Uploaded %s", completed, len(files), file_path)
+            else:
+                results["failed"] += 1
+                if not results["errors"] or results["errors"][-1] != error:
+                    results["errors"].append(error)
+                logger.error("[%d/%d] Failed %s", completed, len(files), file_path)
 
         # Print summary
         print("\n" + "=" * 60)
@@ -254,7 +294,7 @@ Examples:
         logger.info("\nUpload interrupted by user")
         sys.exit(130)
     except Exception as e:
-        logger.error(f"Unexpected error: {e}", exc_info=args.verbose)
+        logger.error("Unexpected error: %s", e, exc_info=args.verbose)
         sys.exit(1)
 
 
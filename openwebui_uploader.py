@@ -5,16 +5,55 @@ This module provides a Python client for interacting with Open WebUI's REST API
 to manage knowledge collections and upload files.
 """
 
+import http.client
+import json
+import mimetypes
 import os
 import logging
+import stat
+import sys
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Iterator, Tuple
+from urllib.parse import urlsplit
 import requests
+from requests.adapters import HTTPAdapter
+from requests_toolbelt import MultipartEncoder
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Optional speedup; stdlib json parsing is used without it
 
 
 logger = logging.getLogger(__name__)
 
+# Cache file mapping api_endpoint -> discovered knowledge endpoint, so the
+# endpoint discovery loop only runs once per server across process restarts
+_ENDPOINT_CACHE_FILE = Path.home() / ".cache" / "openwebui_uploader" / "endpoint.json"
+
+# Allowed extensions: md, txt, pdf, doc, docx
+_ALLOWED_EXTENSIONS = frozenset({".md", ".txt", ".pdf", ".doc", ".docx"})
+
+# System files to skip regardless of extension
+_SKIP_FILENAMES = frozenset({".ds_store", "thumbs.db"})
+
+# How long a fetched collection list stays fresh; short enough that a CLI
+# run never sees stale data, long enough to spare long-running drivers the
+# repeated round trips
+_COLLECTIONS_CACHE_TTL = 30.0
+
+# Files above this size use the sendfile(2) upload fast path where possible
+_SENDFILE_THRESHOLD = 4 * 1024 * 1024
+
+# sendfile(2) pushes file bytes kernel-side straight to the socket, skipping
+# user-space copies. Only usable on Linux and only for plain-HTTP endpoints:
+# writing to a TLS socket's file descriptor would bypass encryption.
+_SENDFILE_AVAILABLE = sys.platform == "linux" and hasattr(os, "sendfile")
+
 
 def is_allowed_file(file_path: str) -> bool:
     """
@@ -26,20 +65,71 @@ def is_allowed_file(file_path: str) -> bool:
     Returns:
         True if file should be processed, False if it should be skipped
     """
-    path = Path(file_path)
-    filename = path.name.lower()
+    # Called once per file on large trees, so avoid Path allocation and
+    # per-call set construction: plain string ops on the basename suffice
+    filename = os.path.basename(file_path).lower()
 
     # Skip system files
-    if filename in [".ds_store", "thumbs.db"]:
+    if filename in _SKIP_FILENAMES:
         return False
 
-    # Get file extension (case-insensitive)
-    extension = path.suffix.lower()
+    # Get file extension (case-insensitive); dot > 0 so dotfiles like
+    # ".md" have no extension, matching Path.suffix semantics
+    dot = filename.rfind(".")
+    return dot > 0 and filename[dot:] in _ALLOWED_EXTENSIONS
+
+
+def _parse_json(response: requests.Response) -> Any:
+    """
+    Parse a response body as JSON, using orjson when available.
+
+    orjson parses the raw bytes directly and is noticeably faster than
+    stdlib json for the many small responses in a batch attach loop. Raises
+    ValueError (orjson.JSONDecodeError subclasses it) on invalid JSON, so
+    callers' existing except ValueError handling applies either way.
+    """
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+def _read_json_guarded(response: requests.Response) -> Optional[Any]:
+    """
+    Read a streamed response as JSON, rejecting HTML bodies early.
+
+    Open WebUI answers wrong API paths with the full SPA HTML page; peeking
+    the first 16 bytes of the stream rejects those with a tiny read instead
+    of downloading and JSON-parsing a multi-KB document. Requires the
+    request to have been made with stream=True.
+
+    Returns:
+        Parsed JSON body, or None if the body is HTML or not valid JSON
+    """
+    content_type = response.headers.get("Content-Type", "").lower()
+    if "text/html" in content_type:
+        response.close()
+        return None
+
+    prefix = response.raw.read(16, decode_content=True)
+    if prefix.lstrip().startswith(b"<"):
+        # HTML body behind a misleading Content-Type; drop the connection
+        # without reading the rest
+        response.close()
+        return None
+
+    body = prefix + response.raw.read(decode_content=True)
+    try:
+        return orjson.loads(body) if orjson is not None else json.loads(body)
+    except ValueError:
+        return None
 
-    # Allowed extensions: md, txt, pdf, doc, docx
-    allowed_extensions = {".md", ".txt", ".pdf", ".doc", ".docx"}
 
-    return extension in allowed_extensions
+def _file_size(file_path: str) -> int:
+    """Return the file size in bytes, or 0 if it cannot be stat'd."""
+    try:
+        return os.path.getsize(file_path)
+    except OSError:
+        return 0
 
 
 class OpenWebUIClient:
@@ -62,13 +152,84 @@ class OpenWebUIClient:
         }
         # Upload headers match the captured browser drag-and-drop request pattern.
         # See CAPTURED_REQUEST_DETAILS.md for reference.
-        # Note: Content-Type is NOT set here - requests library automatically sets
-        # multipart/form-data with boundary when files parameter is used.
+        # Note: Content-Type is set to None so the session's default
+        # (application/json) is dropped and the requests library automatically
+        # sets multipart/form-data with boundary when files parameter is used.
         self.upload_headers = {
             "Authorization": f"Bearer {api_key}",
             "Accept": "application/json",
+            "Content-Type": None,
         }
         self._knowledge_endpoint = None  # Will be discovered on first successful call
+        self._load_cached_endpoint()
+
+        # Cache of collection name -> id, populated lazily from
+        # list_knowledge_collections to avoid re-listing on every lookup
+        self._collection_id_cache: Dict[str, str] = {}
+        self._collections_listed = False
+
+        # TTL cache of the last fetched collection list as a
+        # (monotonic timestamp, collections) pair
+        self._collections_cache: Optional[tuple] = None
+
+        # Persistent session with keep-alive and a tuned connection pool.
+        # Reusing connections avoids per-request DNS lookups and TLS handshakes,
+        # which dominate wall time for small JSON calls. The session is shared
+        # across the upload worker threads (requests.Session is thread-safe for
+        # concurrent requests).
+        self._session = requests.Session()
+        self._session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]
+            ),
+        )
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
+
+    def connect(self) -> None:
+        """
+        Pre-warm the connection pool with a cheap request.
+
+        The first request to a cold pool pays DNS resolution plus TCP and TLS
+        handshakes (~3 RTTs) before any useful work. Calling this before a
+        batch moves that cost off the critical path and seats a keep-alive
+        connection for the uploads to reuse. Failures are ignored; the real
+        requests will surface any connectivity problem.
+        """
+        try:
+            self._session.get(f"{self.api_endpoint}/", timeout=5)
+        except requests.exceptions.RequestException as e:
+            logger.debug("Connection pre-warm failed: %s", e)
+
+    def _load_cached_endpoint(self) -> None:
+        """Load a previously discovered knowledge endpoint from the cache file."""
+        try:
+            with open(_ENDPOINT_CACHE_FILE) as cache_file:
+                cached = json.load(cache_file)
+            endpoint = cached.get(self.api_endpoint)
+            if endpoint:
+                self._knowledge_endpoint = endpoint
+                logger.debug("Loaded cached knowledge endpoint: %s", endpoint)
+        except (OSError, ValueError):
+            pass  # No cache yet, or unreadable - discovery will run as usual
+
+    def _save_cached_endpoint(self) -> None:
+        """Persist the discovered knowledge endpoint so it survives restarts."""
+        try:
+            try:
+                with open(_ENDPOINT_CACHE_FILE) as cache_file:
+                    cached = json.load(cache_file)
+            except (OSError, ValueError):
+                cached = {}
+            cached[self.api_endpoint] = self._knowledge_endpoint
+            _ENDPOINT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(_ENDPOINT_CACHE_FILE, "w") as cache_file:
+                json.dump(cached, cache_file)
+        except OSError as e:
+            logger.debug("Could not persist endpoint cache: %s", e)
 
     def _make_request(
         self, method: str, endpoint: str, **kwargs
@@ -82,15 +243,22 @@ class OpenWebUIClient:
             **kwargs: Additional arguments to pass to requests
 
         Returns:
-            Response object or None if request failed
+            Response object, or None if no response was received (connection
+            error, timeout, etc.). Responses with error status codes are
+            returned so callers can inspect the status; note that a Response
+            is falsy when its status indicates an error, so `if response:`
+            still means "request succeeded".
         """
         url = f"{self.api_endpoint}{endpoint}"
         try:
-            response = requests.request(method, url, **kwargs)
+            response = self._session.request(method, url, **kwargs)
             response.raise_for_status()
             return response
+        except requests.exceptions.HTTPError as e:
+            logger.error("API request failed: %s %s - %s", method, url, e)
+            return e.response
         except requests.exceptions.RequestException as e:
-            logger.error(f"API request failed: {method} {url} - {e}")
+            logger.error("API request failed: %s %s - %s", method, url, e)
             return None
 
     def list_knowledge_collections(self) -> List[Dict[str, Any]]:
@@ -100,6 +268,27 @@ class OpenWebUIClient:
         Returns:
             List of knowledge collection dictionaries, or empty list on error
         """
+        # Serve from the TTL cache when fresh; long-running drivers call
+        # this repeatedly and the list rarely changes between calls
+        if self._collections_cache is not None:
+            cached_at, cached_list = self._collections_cache
+            if time.monotonic() - cached_at < _COLLECTIONS_CACHE_TTL:
+                return cached_list
+
+        # Fast path: a known-good endpoint skips the discovery loop entirely
+        if self._knowledge_endpoint:
+            result = self._try_list_endpoint(self._knowledge_endpoint)
+            if result is not None:
+                self._collections_cache = (time.monotonic(), result)
+                return result
+            # Cached endpoint stopped working (server upgrade/config change);
+            # forget it and fall through to discovery
+            logger.debug(
+                "Cached endpoint %s no longer valid, rediscovering",
+                self._knowledge_endpoint,
+            )
+            self._knowledge_endpoint = None
+
         # Try different endpoint variations
         endpoints_to_try = [
             "/api/v1/workspace/knowledge",
@@ -107,28 +296,56 @@ class OpenWebUIClient:
             "/api/v1/knowledge",
         ]
 
-        for endpoint in endpoints_to_try:
-            response = self._make_request("GET", endpoint, headers=self.headers)
-
-            if response:
-                # Check if response is HTML (wrong endpoint)
-                content_type = response.headers.get("Content-Type", "").lower()
-                if "text/html" in content_type:
-                    continue  # Try next endpoint
-
-                try:
-                    result = response.json()
+        # Probe all candidates concurrently with short timeouts: the working
+        # endpoint answers in ~1 RTT instead of waiting out each wrong
+        # candidate's timeout in sequence. Only one endpoint variation exists
+        # per server version, so the first JSON answer is the right one.
+        executor = ThreadPoolExecutor(max_workers=len(endpoints_to_try))
+        try:
+            futures = {
+                executor.submit(self._try_list_endpoint, endpoint, 5.0): endpoint
+                for endpoint in endpoints_to_try
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
                     # Store successful endpoint for future use
-                    self._knowledge_endpoint = endpoint
+                    self._knowledge_endpoint = futures[future]
+                    self._save_cached_endpoint()
+                    self._collections_cache = (time.monotonic(), result)
                     return result
-                except ValueError:
-                    continue  # Try next endpoint
+        finally:
+            # Don't block on probes that are still waiting on their timeout;
+            # their results are discarded either way
+            executor.shutdown(wait=False, cancel_futures=True)
 
         logger.error(
             "Failed to list knowledge collections: all endpoint variations returned non-JSON responses"
         )
         return []
 
+    def _try_list_endpoint(
+        self, endpoint: str, timeout: Optional[float] = None
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        GET a candidate knowledge endpoint and parse the collection list.
+
+        Args:
+            endpoint: Candidate endpoint path to probe
+            timeout: Optional per-request timeout in seconds, used by the
+                concurrent discovery probes
+
+        Returns:
+            Parsed collection list, or None if the endpoint did not respond
+            with JSON (wrong path, HTML SPA page, or request failure)
+        """
+        response = self._make_request(
+            "GET", endpoint, headers=self.headers, timeout=timeout, stream=True
+        )
+        if response:
+            return _read_json_guarded(response)
+        return None
+
     def get_knowledge_collection_id(self, name: str) -> Optional[str]:
         """
         Get the ID of a knowledge collection by name.
@@ -139,11 +356,35 @@ class OpenWebUIClient:
         Returns:
             Collection ID if found, None otherwise
         """
+        if name in self._collection_id_cache:
+            return self._collection_id_cache[name]
+
+        # Negative cache: if we already listed collections and the name was
+        # not there, skip the round trip
+        if self._collections_listed:
+            return None
+
         collections = self.list_knowledge_collections()
-        for collection in collections:
-            if collection.get("name") == name:
-                return collection.get("id")
-        return None
+        self._collection_id_cache.update(
+            {
+                collection["name"]: collection["id"]
+                for collection in collections
+                if collection.get("name") and collection.get("id")
+            }
+        )
+        self._collections_listed = True
+        return self._collection_id_cache.get(name)
+
+    def invalidate_cache(self) -> None:
+        """
+        Clear the cached collection listing and name -> id mapping.
+
+        Call this if knowledge collections were created or deleted outside
+        this client instance.
+        """
+        self._collection_id_cache.clear()
+        self._collections_listed = False
+        self._collections_cache = None
 
     def create_knowledge_collection(
         self, name: str, description: str = ""
@@ -158,43 +399,42 @@ class OpenWebUIClient:
         Returns:
             Collection ID if successful, None otherwise
         """
-        # Determine base endpoint - use discovered one or try variations
+        # With a discovered endpoint there is no need to probe the variations;
+        # otherwise walk the same candidates as list_knowledge_collections
         if self._knowledge_endpoint:
-            base_endpoint = self._knowledge_endpoint
+            endpoints_to_try = [f"{self._knowledge_endpoint}/create"]
         else:
-            base_endpoint = "/api/v1/workspace/knowledge"  # Try workspace first
-
-        endpoints_to_try = [
-            f"{base_endpoint}/create",
-            "/api/v1/workspace/knowledge/create",
-            "/api/v1/knowledges/create",
-            "/api/v1/knowledge/create",
-        ]
+            endpoints_to_try = [
+                "/api/v1/workspace/knowledge/create",
+                "/api/v1/knowledges/create",
+                "/api/v1/knowledge/create",
+            ]
 
         payload = {"name": name, "description": description}
 
         for endpoint in endpoints_to_try:
             response = self._make_request(
-                "POST", endpoint, headers=self.headers, json=payload
+                "POST", endpoint, headers=self.headers, json=payload, stream=True
             )
             if response:
-                # Check if response is HTML (wrong endpoint)
-                content_type = response.headers.get("Content-Type", "").lower()
-                if "text/html" in content_type:
-                    continue  # Try next endpoint
-
-                try:
-                    result = response.json()
+                # Rejects HTML from wrong endpoints with a 16-byte peek
+                result = _read_json_guarded(response)
+                if result is not None:
                     collection_id = result.get("id")
                     logger.info(
-                        f"Created knowledge collection '{name}' with ID: {collection_id}"
+                        "Created knowledge collection '%s' with ID: %s",
+                        name,
+                        collection_id,
                     )
                     # Store successful endpoint base for future use
                     if not self._knowledge_endpoint:
                         self._knowledge_endpoint = endpoint.replace("/create", "")
+                        self._save_cached_endpoint()
+                    if collection_id:
+                        self._collection_id_cache[name] = collection_id
+                    # The cached listing no longer reflects the server state
+                    self._collections_cache = None
                     return collection_id
-                except ValueError:
-                    continue  # Try next endpoint
         logger.error(
             "Failed to create knowledge collection: all endpoint variations failed"
         )
@@ -220,31 +460,87 @@ class OpenWebUIClient:
         Returns:
             File ID if successful, None otherwise
         """
-        if not os.path.isfile(file_path):
-            logger.error(f"File not found: {file_path}")
-            return None
-
         # Check if file is allowed (skip system files and non-text formats)
         if not is_allowed_file(file_path):
-            logger.debug(f"Skipping file (not allowed): {file_path}")
+            logger.debug("Skipping file (not allowed): %s", file_path)
             return None
 
+        # One open serves everything downstream: fstat for the size (instead
+        # of a separate os.path.isfile stat), the sendfile gate, and the
+        # upload body itself. O_NONBLOCK is a no-op for regular files but
+        # keeps open(2) from blocking forever on a FIFO with an allowed
+        # extension; the S_ISREG check below rejects it instead.
+        try:
+            file_descriptor = os.open(file_path, os.O_RDONLY | os.O_NONBLOCK)
+        except FileNotFoundError:
+            logger.error("File not found: %s", file_path)
+            return None
+        except OSError as e:
+            logger.error("Error reading file %s: %s", file_path, e)
+            return None
+
+        file_stat = os.fstat(file_descriptor)
+        if not stat.S_ISREG(file_stat.st_mode):
+            os.close(file_descriptor)
+            logger.error("File not found: %s", file_path)
+            return None
+        file_size = file_stat.st_size
+
+        # Large files on plain-HTTP endpoints can bypass user-space buffering
+        # entirely and let the kernel stream the bytes to the socket
+        if (
+            _SENDFILE_AVAILABLE
+            and self.api_endpoint.startswith("http://")
+            and file_size > _SENDFILE_THRESHOLD
+        ):
+            try:
+                file_id = self._upload_file_sendfile(
+                    file_path, file_descriptor, file_size
+                )
+            except (OSError, http.client.HTTPException) as e:
+                # sendfile leaves the descriptor offset untouched (it seeks by
+                # explicit offset), so the buffered path below can retry it
+                logger.debug(
+                    "sendfile upload failed for %s (%s), falling back to buffered upload",
+                    file_path,
+                    e,
+                )
+            else:
+                os.close(file_descriptor)
+                return file_id
+
         try:
-            with open(file_path, "rb") as file:
+            with os.fdopen(file_descriptor, "rb") as file:
                 # Prepare multipart/form-data payload matching browser upload pattern.
                 # Form field MUST be named "file" (not "files" or any other name).
-                # Tuple format: (filename, file_object) - requests library handles Content-Type.
-                files = {"file": (os.path.basename(file_path), file)}
+                # MultipartEncoder streams the file in chunks rather than
+                # buffering the whole body in memory, so large PDFs upload
+                # with O(chunk) RSS and the first bytes hit the wire
+                # immediately.
+                file_name = os.path.basename(file_path)
+                mime_type = (
+                    mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+                )
+                encoder = MultipartEncoder(
+                    fields={"file": (file_name, file, mime_type)}
+                )
                 # POST to /api/v1/files/ endpoint with upload headers.
-                # Headers include Authorization (Bearer token) and Accept: application/json.
+                # Headers include Authorization (Bearer token) and Accept:
+                # application/json; Content-Type carries the encoder's boundary.
+                # Content-Length is declared upfront from the encoder's framed
+                # size (derived from a single fstat of the open file), so
+                # requests never probes or re-reads the body to size it.
+                headers = dict(self.upload_headers)
+                headers["Content-Type"] = encoder.content_type
+                headers["Content-Length"] = str(encoder.len)
                 response = self._make_request(
-                    "POST", "/api/v1/files/", headers=self.upload_headers, files=files
+                    "POST", "/api/v1/files/", headers=headers, data=encoder
                 )
                 if response:
                     try:
                         # Parse JSON response matching captured structure:
                         # {id, user_id, filename, data: {status}, meta: {name, size, ...}}
-                        result = response.json()
+                        result = _parse_json(response)
                         file_id = result.get("id")
                         filename = result.get("filename") or result.get("meta", {}).get(
                             "name"
@@ -252,29 +548,127 @@ class OpenWebUIClient:
                         file_size = result.get("meta", {}).get("size")
                         status = result.get("data", {}).get("status", "unknown")
 
-                        logger.info(
-                            f"Uploaded file '{file_path}' with ID: {file_id} "
-                            f"(filename: {filename}, size: {file_size}, status: {status})"
-                        )
+                        # Guarded: this runs once per file in the hot path
+                        if logger.isEnabledFor(logging.INFO):
+                            logger.info(
+                                "Uploaded file '%s' with ID: %s "
+                                "(filename: %s, size: %s, status: %s)",
+                                file_path,
+                                file_id,
+                                filename,
+                                file_size,
+                                status,
+                            )
                         return file_id
                     except ValueError as e:
                         logger.error(
-                            f"Failed to parse response as JSON: {e}. "
-                            f"Response status: {response.status_code}, "
-                            f"Response text: {response.text[:200]}"
+                            "Failed to parse response as JSON: %s. "
+                            "Response status: %s, Response text: %s",
+                            e,
+                            response.status_code,
+                            response.text[:200],
                         )
                         return None
                 else:
                     logger.error(
-                        f"Upload request failed for '{file_path}'. "
-                        f"Check API endpoint and authentication."
+                        "Upload request failed for '%s'. "
+                        "Check API endpoint and authentication.",
+                        file_path,
                     )
                     return None
         except IOError as e:
-            logger.error(f"Error reading file {file_path}: {e}")
+            logger.error("Error reading file %s: %s", file_path, e)
             return None
         return None
 
+    def _upload_file_sendfile(
+        self, file_path: str, file_descriptor: int, size: int
+    ) -> Optional[str]:
+        """
+        Upload a large file with sendfile(2) over a plain-HTTP connection.
+
+        The multipart framing (preamble and epilogue) is built by hand and the
+        file body is pushed kernel-to-socket with os.sendfile, so the bytes
+        never pass through a Python buffer. Raises OSError or
+        http.client.HTTPException on transport problems; the caller falls
+        back to the buffered upload path in that case.
+
+        Args:
+            file_path: Path to the file to upload
+            file_descriptor: Open read-only descriptor for the file; ownership
+                stays with the caller
+            size: File size in bytes, from the caller's fstat
+
+        Returns:
+            File ID if successful, None otherwise
+        """
+        parts = urlsplit(self.api_endpoint)
+        file_name = os.path.basename(file_path)
+        mime_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+        boundary = uuid.uuid4().hex
+        # Escape quotes and CR/LF the same way urllib3 does for the buffered
+        # path (HTML5 header-param encoding), so a hostile filename cannot
+        # break out of the hand-built Content-Disposition header
+        safe_name = file_name.translate(
+            {ord('"'): "%22", ord("\r"): "%0D", ord("\n"): "%0A"}
+        )
+        preamble = (
+            f"--{boundary}\r\n"
+            f'Content-Disposition: form-data; name="file"; filename="{safe_name}"\r\n'
+            f"Content-Type: {mime_type}\r\n\r\n"
+        ).encode()
+        epilogue = f"\r\n--{boundary}--\r\n".encode()
+
+        connection = http.client.HTTPConnection(parts.hostname, parts.port or 80)
+        try:
+            # Keep any path prefix from api_endpoint, matching how
+            # _make_request builds f"{self.api_endpoint}{endpoint}"
+            connection.putrequest("POST", f"{parts.path}/api/v1/files/")
+            connection.putheader("Authorization", f"Bearer {self.api_key}")
+            connection.putheader("Accept", "application/json")
+            connection.putheader(
+                "Content-Type", f"multipart/form-data; boundary={boundary}"
+            )
+            connection.putheader(
+                "Content-Length", str(len(preamble) + size + len(epilogue))
+            )
+            connection.endheaders()
+            connection.send(preamble)
+
+            # Kernel-side copy loop: sendfile may send less than asked
+            offset = 0
+            socket_fd = connection.sock.fileno()
+            while offset < size:
+                sent = os.sendfile(socket_fd, file_descriptor, offset, size - offset)
+                if sent == 0:
+                    raise OSError("sendfile returned 0 before EOF")
+                offset += sent
+
+            connection.send(epilogue)
+            response = connection.getresponse()
+            body = response.read()
+        finally:
+            connection.close()
+
+        if response.status >= 400:
+            logger.error(
+                "Upload request failed for '%s': HTTP %s", file_path, response.status
+            )
+            return None
+
+        try:
+            result = orjson.loads(body) if orjson is not None else json.loads(body)
+        except ValueError as e:
+            logger.error("Failed to parse response as JSON: %s", e)
+            return None
+
+        file_id = result.get("id")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info(
+                "Uploaded file '%s' with ID: %s (via sendfile)", file_path, file_id
+            )
+        return file_id
+
     def add_file_to_knowledge(
         self,
         knowledge_id: str,
@@ -289,7 +683,8 @@ class OpenWebUIClient:
             knowledge_id: ID of the knowledge collection
             file_id: ID of the uploaded file
             retries: Number of retry attempts (default: 3)
-            retry_delay: Delay between retries in seconds (default: 1.0)
+            retry_delay: Base delay in seconds for exponential backoff between
+                retries, doubled each attempt and capped at 30 s (default: 5.0)
 
         Returns:
             True if successful, False otherwise
@@ -300,6 +695,10 @@ class OpenWebUIClient:
         # Retry logic helps handle transient server-side processing issues
         payload = {"file_id": file_id}
 
+        # Status codes that indicate the file is not yet processed server-side
+        # and the request is worth retrying with backoff
+        retryable_statuses = {409, 425, 503}
+
         for attempt in range(retries):
             response = self._make_request(
                 "POST",
@@ -310,40 +709,92 @@ class OpenWebUIClient:
 
             if response:
                 logger.info(
-                    f"Added file {file_id} to knowledge collection {knowledge_id}"
+                    "Added file %s to knowledge collection %s", file_id, knowledge_id
                 )
                 return True
 
-            # If not the last attempt, wait before retrying
+            # Non-retryable client error (bad request, auth, not found, ...):
+            # retrying will not help, so fail fast
+            if (
+                response is not None
+                and 400 <= response.status_code < 500
+                and response.status_code not in retryable_statuses
+            ):
+                logger.error(
+                    "Non-retryable error %s adding file %s to knowledge collection %s",
+                    response.status_code,
+                    file_id,
+                    knowledge_id,
+                )
+                break
+
+            # Transient failure: back off exponentially before retrying
             if attempt < retries - 1:
+                delay = min(retry_delay * (2**attempt), 30.0)
                 logger.debug(
-                    f"Retry {attempt + 1}/{retries} failed, waiting {retry_delay}s before retry..."
+                    "Retry %s/%s failed, waiting %ss before retry...",
+                    attempt + 1,
+                    retries,
+                    delay,
                 )
-                time.sleep(retry_delay)
-
-        logger.error(
-            f"Failed to add file {file_id} to knowledge collection {knowledge_id} after {retries} attempts"
-        )
+                time.sleep(delay)
+        else:
+            # Only after exhausting every attempt; the fail-fast break above
+            # already logged its non-retryable error
+            logger.error(
+                "Failed to add file %s to knowledge collection %s after %s attempts",
+                file_id,
+                knowledge_id,
+                retries,
+            )
         return False
 
-    def upload_files_to_knowledge(
+    def _upload_and_attach(
+        self, file_path: str, knowledge_id: str
+    ) -> Optional[str]:
+        """
+        Upload a single file and attach it to a knowledge collection.
+
+        Args:
+            file_path: Path to the file to upload
+            knowledge_id: ID of the target knowledge collection
+
+        Returns:
+            None on success, error message string on failure
+        """
+        file_id = self.upload_file(file_path)
+        if not file_id:
+            return f"Failed to upload {file_path}"
+
+        if not self.add_file_to_knowledge(knowledge_id, file_id):
+            return f"Failed to add {file_path} to knowledge collection"
+        return None
+
+    def iter_upload_files_to_knowledge(
         self,
         knowledge_name: str,
         file_paths: List[str],
         create_if_missing: bool = False,
         description: str = "",
-    ) -> Dict[str, Any]:
+        max_concurrency: int = 16,
+    ) -> Iterator[Tuple[str, bool, Optional[str]]]:
         """
-        High-level method to upload multiple files to a knowledge collection.
+        Upload files to a knowledge collection, yielding results as they land.
+
+        Streaming variant of upload_files_to_knowledge: each completed file
+        produces a (file_path, success, error) tuple the moment its
+        upload+attach finishes, so callers can report progress and release
+        per-file state instead of buffering the whole result set.
 
         Args:
             knowledge_name: Name of the knowledge collection
             file_paths: List of file paths to upload
             create_if_missing: If True, create the collection if it doesn't exist
             description: Optional description for the collection (if creating)
+            max_concurrency: Maximum number of concurrent file uploads (default: 16)
 
-        Returns:
-            Dictionary with 'success', 'failed', 'total' counts and 'errors' list
+        Yields:
+            (file_path, success, error) tuples; error is None on success
         """
         # Get or create knowledge collection
         knowledge_id = self.get_knowledge_collection_id(knowledge_name)
@@ -354,41 +805,71 @@ class OpenWebUIClient:
                     knowledge_name, description
                 )
                 if not knowledge_id:
-                    return {
-                        "success": 0,
-                        "failed": len(file_paths),
-                        "total": len(file_paths),
-                        "errors": [
-                            f"Failed to create knowledge collection '{knowledge_name}'"
-                        ],
-                    }
+                    error = f"Failed to create knowledge collection '{knowledge_name}'"
+                    for file_path in file_paths:
+                        yield (file_path, False, error)
+                    return
             else:
-                return {
-                    "success": 0,
-                    "failed": len(file_paths),
-                    "total": len(file_paths),
-                    "errors": [f"Knowledge collection '{knowledge_name}' not found"],
-                }
-
-        # Upload files
-        results = {"success": 0, "failed": 0, "total": len(file_paths), "errors": []}
+                error = f"Knowledge collection '{knowledge_name}' not found"
+                for file_path in file_paths:
+                    yield (file_path, False, error)
+                return
+
+        # Submit largest files first: under bounded concurrency this keeps a
+        # big file from starting last and dominating the batch's tail latency
+        file_paths = sorted(file_paths, key=_file_size, reverse=True)
+
+        # Upload files concurrently - each worker handles upload + attach for one file
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {
+                executor.submit(self._upload_and_attach, file_path, knowledge_id): file_path
+                for file_path in file_paths
+            }
+            for future in as_completed(futures):
+                error = future.result()
+                yield (futures[future], error is None, error)
 
-        for file_path in file_paths:
-            file_id = self.upload_file(file_path)
-            if file_id:
-                # Small delay to allow server to process the uploaded file
-                # This helps avoid race conditions with server-side file processing
-                time.sleep(0.5)
+    def upload_files_to_knowledge(
+        self,
+        knowledge_name: str,
+        file_paths: List[str],
+        create_if_missing: bool = False,
+        description: str = "",
+        max_concurrency: int = 16,
+    ) -> Dict[str, Any]:
+        """
+        High-level method to upload multiple files to a knowledge collection.
 
-                if self.add_file_to_knowledge(knowledge_id, file_id):
-                    results["success"] += 1
-                else:
-                    results["failed"] += 1
-                    results["errors"].append(
-                        f"Failed to add {file_path} to knowledge collection"
-                    )
+        Thin wrapper aggregating iter_upload_files_to_knowledge into a
+        summary dictionary; use the iterator directly for streaming progress
+        on very large batches.
+
+        Args:
+            knowledge_name: Name of the knowledge collection
+            file_paths: List of file paths to upload
+            create_if_missing: If True, create the collection if it doesn't exist
+            description: Optional description for the collection (if creating)
+            max_concurrency: Maximum number of concurrent file uploads (default: 16)
+
+        Returns:
+            Dictionary with 'success', 'failed', 'total' counts and 'errors' list
+        """
+        results = {"success": 0, "failed": 0, "total": len(file_paths), "errors": []}
+
+        for _file_path, success, error in self.iter_upload_files_to_knowledge(
+            knowledge_name,
+            file_paths,
+            create_if_missing=create_if_missing,
+            description=description,
+            max_concurrency=max_concurrency,
+        ):
+            if success:
+                results["success"] += 1
             else:
                 results["failed"] += 1
-                results["errors"].append(f"Failed to upload {file_path}")
+                # Collection-level failures repeat one message per file;
+                # collapse those runs so the errors list reads as before
+                if not results["errors"] or results["errors"][-1] != error:
+                    results["errors"].append(error)
 
         return results
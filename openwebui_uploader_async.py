@@ -0,0 +1,462 @@
+"""
+Open WebUI Knowledge Uploader - Async Client Module
+
+This module provides an asyncio/aiohttp variant of OpenWebUIClient for
+high-fan-out uploads. The workload is network-I/O-bound, so a single event
+loop with many in-flight requests scales further than a thread pool while
+using one OS thread. The API mirrors the sync client; a sync entry point is
+provided via asyncio.run for callers that do not run an event loop.
+"""
+
+import asyncio
+import logging
+import mimetypes
+import os
+from typing import Optional, List, Dict, Any
+
+import aiofiles
+import aiohttp
+
+from openwebui_uploader import is_allowed_file, _file_size
+
+
+logger = logging.getLogger(__name__)
+
+# Read size for streaming file bodies into the upload request
+_UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+class AsyncOpenWebUIClient:
+    """Async client for interacting with Open WebUI REST API.
+
+    Use as an async context manager so the underlying aiohttp session is
+    closed cleanly:
+
+        async with AsyncOpenWebUIClient(endpoint, key) as client:
+            results = await client.upload_files_to_knowledge(...)
+    """
+
+    def __init__(self, api_endpoint: str, api_key: str):
+        """
+        Initialize the async Open WebUI client.
+
+        Args:
+            api_endpoint: Base URL of the Open WebUI API (e.g., 'http://localhost:3000')
+            api_key: API key for authentication
+        """
+        self.api_endpoint = api_endpoint.rstrip("/")
+        self.api_key = api_key
+        self.headers = {
+            "Authorization": f"Bearer {api_key}",
+            "Accept": "application/json",
+        }
+        self._knowledge_endpoint: Optional[str] = None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    async def __aenter__(self) -> "AsyncOpenWebUIClient":
+        await self._ensure_session()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        await self.close()
+
+    async def _ensure_session(self) -> aiohttp.ClientSession:
+        """Create the shared aiohttp session on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                headers=self.headers,
+                connector=aiohttp.TCPConnector(limit=64, ttl_dns_cache=300),
+            )
+        return self._session
+
+    async def close(self) -> None:
+        """Close the underlying aiohttp session."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+
+    async def _request_json(
+        self, method: str, endpoint: str, return_status: bool = False, **kwargs
+    ) -> Any:
+        """
+        Make an HTTP request and parse the JSON response.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint path (e.g., '/api/v1/knowledge')
+            return_status: If True, return a (body, status) tuple so callers
+                can tell permanent HTTP errors from transport failures
+            **kwargs: Additional arguments to pass to aiohttp
+
+        Returns:
+            Parsed JSON body, or None if the request failed or the response
+            was not JSON (e.g. the SPA HTML page from a wrong endpoint).
+            With return_status, a (body, status) tuple instead; status is
+            None when no response was received (connection error, timeout)
+        """
+        session = await self._ensure_session()
+        url = f"{self.api_endpoint}{endpoint}"
+        status: Optional[int] = None
+        result: Optional[Any] = None
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                status = response.status
+                response.raise_for_status()
+                if "text/html" not in response.headers.get("Content-Type", "").lower():
+                    result = await response.json(content_type=None)
+        except (aiohttp.ClientError, ValueError, asyncio.TimeoutError) as e:
+            logger.error("API request failed: %s %s - %s", method, url, e)
+        return (result, status) if return_status else result
+
+    async def list_knowledge_collections(self) -> List[Dict[str, Any]]:
+        """
+        List all knowledge collections.
+
+        Returns:
+            List of knowledge collection dictionaries, or empty list on error
+        """
+        if self._knowledge_endpoint:
+            result = await self._request_json("GET", self._knowledge_endpoint)
+            if result is not None:
+                return result
+            self._knowledge_endpoint = None
+
+        # Try different endpoint variations
+        endpoints_to_try = [
+            "/api/v1/workspace/knowledge",
+            "/api/v1/knowledges",
+            "/api/v1/knowledge",
+        ]
+
+        for endpoint in endpoints_to_try:
+            result = await self._request_json("GET", endpoint)
+            if result is not None:
+                self._knowledge_endpoint = endpoint
+                return result
+
+        logger.error(
+            "Failed to list knowledge collections: all endpoint variations returned non-JSON responses"
+        )
+        return []
+
+    async def get_knowledge_collection_id(self, name: str) -> Optional[str]:
+        """
+        Get the ID of a knowledge collection by name.
+
+        Args:
+            name: Name of the knowledge collection
+
+        Returns:
+            Collection ID if found, None otherwise
+        """
+        collections = await self.list_knowledge_collections()
+        for collection in collections:
+            if collection.get("name") == name:
+                return collection.get("id")
+        return None
+
+    async def create_knowledge_collection(
+        self, name: str, description: str = ""
+    ) -> Optional[str]:
+        """
+        Create a new knowledge collection.
+
+        Args:
+            name: Name of the knowledge collection
+            description: Optional description for the collection
+
+        Returns:
+            Collection ID if successful, None otherwise
+        """
+        if self._knowledge_endpoint:
+            endpoints_to_try = [f"{self._knowledge_endpoint}/create"]
+        else:
+            endpoints_to_try = [
+                "/api/v1/workspace/knowledge/create",
+                "/api/v1/knowledges/create",
+                "/api/v1/knowledge/create",
+            ]
+
+        payload = {"name": name, "description": description}
+
+        for endpoint in endpoints_to_try:
+            result = await self._request_json("POST", endpoint, json=payload)
+            if result is not None:
+                collection_id = result.get("id")
+                logger.info(
+                    "Created knowledge collection '%s' with ID: %s",
+                    name,
+                    collection_id,
+                )
+                if not self._knowledge_endpoint:
+                    self._knowledge_endpoint = endpoint.replace("/create", "")
+                return collection_id
+
+        logger.error(
+            "Failed to create knowledge collection: all endpoint variations failed"
+        )
+        return None
+
+    @staticmethod
+    async def _file_chunks(file_path: str):
+        """Yield the file contents in chunks without blocking the event loop."""
+        async with aiofiles.open(file_path, "rb") as file:
+            while True:
+                chunk = await file.read(_UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+
+    async def upload_file(self, file_path: str) -> Optional[str]:
+        """
+        Upload a file to Open WebUI using POST /api/v1/files/.
+
+        The request pattern matches the sync client: multipart/form-data with
+        a form field named "file". The body is streamed from disk in chunks
+        so large files do not inflate memory.
+
+        Args:
+            file_path: Path to the file to upload
+
+        Returns:
+            File ID if successful, None otherwise
+        """
+        if not os.path.isfile(file_path):
+            logger.error("File not found: %s", file_path)
+            return None
+
+        if not is_allowed_file(file_path):
+            logger.debug("Skipping file (not allowed): %s", file_path)
+            return None
+
+        file_name = os.path.basename(file_path)
+        mime_type = mimetypes.guess_type(file_name)[0] or "application/octet-stream"
+        form = aiohttp.FormData()
+        form.add_field(
+            "file", self._file_chunks(file_path), filename=file_name,
+            content_type=mime_type,
+        )
+
+        result = await self._request_json("POST", "/api/v1/files/", data=form)
+        if result is None:
+            logger.error(
+                "Upload request failed for '%s'. "
+                "Check API endpoint and authentication.",
+                file_path,
+            )
+            return None
+
+        file_id = result.get("id")
+        logger.info("Uploaded file '%s' with ID: %s", file_path, file_id)
+        return file_id
+
+    async def add_file_to_knowledge(
+        self,
+        knowledge_id: str,
+        file_id: str,
+        retries: int = 3,
+        retry_delay: float = 5.0,
+    ) -> bool:
+        """
+        Associate an uploaded file with a knowledge collection.
+
+        Args:
+            knowledge_id: ID of the knowledge collection
+            file_id: ID of the uploaded file
+            retries: Number of retry attempts (default: 3)
+            retry_delay: Base delay in seconds for exponential backoff between
+                retries, doubled each attempt and capped at 30 s (default: 5.0)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        # Same payload constraint as the sync client: just file_id, no
+        # metadatas field
+        payload = {"file_id": file_id}
+
+        # Status codes that indicate the file is not yet processed server-side
+        # and the request is worth retrying with backoff
+        retryable_statuses = {409, 425, 503}
+
+        for attempt in range(retries):
+            result, status = await self._request_json(
+                "POST",
+                f"/api/v1/knowledge/{knowledge_id}/file/add",
+                return_status=True,
+                json=payload,
+            )
+
+            if result is not None:
+                logger.info(
+                    "Added file %s to knowledge collection %s", file_id, knowledge_id
+                )
+                return True
+
+            # Non-retryable client error (bad request, auth, not found, ...):
+            # retrying will not help, so fail fast like the sync client
+            if (
+                status is not None
+                and 400 <= status < 500
+                and status not in retryable_statuses
+            ):
+                logger.error(
+                    "Non-retryable error %s adding file %s to knowledge collection %s",
+                    status,
+                    file_id,
+                    knowledge_id,
+                )
+                break
+
+            # Transient failure: back off exponentially before retrying
+            if attempt < retries - 1:
+                delay = min(retry_delay * (2**attempt), 30.0)
+                logger.debug(
+                    "Retry %s/%s failed, waiting %ss before retry...",
+                    attempt + 1,
+                    retries,
+                    delay,
+                )
+                await asyncio.sleep(delay)
+        else:
+            # Only after exhausting every attempt; the fail-fast break above
+            # already logged its non-retryable error
+            logger.error(
+                "Failed to add file %s to knowledge collection %s after %s attempts",
+                file_id,
+                knowledge_id,
+                retries,
+            )
+        return False
+
+    async def upload_files_to_knowledge(
+        self,
+        knowledge_name: str,
+        file_paths: List[str],
+        create_if_missing: bool = False,
+        description: str = "",
+        max_concurrency: int = 16,
+    ) -> Dict[str, Any]:
+        """
+        High-level method to upload multiple files to a knowledge collection.
+
+        Uploads and attaches run as decoupled pipeline stages: producers
+        upload files (bounded by an asyncio.Semaphore) and hand file IDs
+        through a queue to the attach stage, which runs each attach in its
+        own task. The stages overlap, so per-file wall time approaches
+        max(upload, attach) instead of their sum.
+
+        Args:
+            knowledge_name: Name of the knowledge collection
+            file_paths: List of file paths to upload
+            create_if_missing: If True, create the collection if it doesn't exist
+            description: Optional description for the collection (if creating)
+            max_concurrency: Maximum number of concurrent file uploads (default: 16)
+
+        Returns:
+            Dictionary with 'success', 'failed', 'total' counts and 'errors' list
+        """
+        knowledge_id = await self.get_knowledge_collection_id(knowledge_name)
+
+        if not knowledge_id:
+            if create_if_missing:
+                knowledge_id = await self.create_knowledge_collection(
+                    knowledge_name, description
+                )
+                if not knowledge_id:
+                    return {
+                        "success": 0,
+                        "failed": len(file_paths),
+                        "total": len(file_paths),
+                        "errors": [
+                            f"Failed to create knowledge collection '{knowledge_name}'"
+                        ],
+                    }
+            else:
+                return {
+                    "success": 0,
+                    "failed": len(file_paths),
+                    "total": len(file_paths),
+                    "errors": [f"Knowledge collection '{knowledge_name}' not found"],
+                }
+
+        results = {"success": 0, "failed": 0, "total": len(file_paths), "errors": []}
+
+        # Submit largest files first: under bounded concurrency this keeps a
+        # big file from starting last and dominating the batch's tail latency
+        file_paths = sorted(file_paths, key=_file_size, reverse=True)
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce(file_path: str) -> None:
+            """Upload one file and hand its ID to the attach stage."""
+            async with semaphore:
+                file_id = await self.upload_file(file_path)
+            if file_id:
+                await queue.put((file_path, file_id))
+            else:
+                results["failed"] += 1
+                results["errors"].append(f"Failed to upload {file_path}")
+
+        attach_semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def attach_one(file_path: str, file_id: str) -> None:
+            """Attach one uploaded file and record the outcome."""
+            async with attach_semaphore:
+                if await self.add_file_to_knowledge(knowledge_id, file_id):
+                    results["success"] += 1
+                else:
+                    results["failed"] += 1
+                    results["errors"].append(
+                        f"Failed to add {file_path} to knowledge collection"
+                    )
+
+        async def consume() -> None:
+            """Spawn attach tasks until the shutdown sentinel arrives."""
+            # Each attach runs in its own task so one file's retry backoff
+            # sleeps alone instead of head-of-line-blocking the queue
+            attach_tasks = []
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                attach_tasks.append(asyncio.create_task(attach_one(*item)))
+            if attach_tasks:
+                await asyncio.gather(*attach_tasks)
+
+        async def run_producers() -> None:
+            """Run all uploads, then signal the consumer to shut down."""
+            await asyncio.gather(*[produce(file_path) for file_path in file_paths])
+            await queue.put(None)
+
+        await asyncio.gather(run_producers(), consume())
+
+        return results
+
+
+def upload_files_to_knowledge_sync(
+    api_endpoint: str,
+    api_key: str,
+    knowledge_name: str,
+    file_paths: List[str],
+    create_if_missing: bool = False,
+    description: str = "",
+    max_concurrency: int = 16,
+) -> Dict[str, Any]:
+    """
+    Sync entry point: run the async upload pipeline to completion.
+
+    Accepts the same arguments as AsyncOpenWebUIClient plus
+    upload_files_to_knowledge, and returns the same results dictionary.
+    """
+
+    async def _run() -> Dict[str, Any]:
+        async with AsyncOpenWebUIClient(api_endpoint, api_key) as client:
+            return await client.upload_files_to_knowledge(
+                knowledge_name,
+                file_paths,
+                create_if_missing=create_if_missing,
+                description=description,
+                max_concurrency=max_concurrency,
+            )
+
+    return asyncio.run(_run())